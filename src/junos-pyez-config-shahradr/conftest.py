@@ -0,0 +1,9 @@
+"""
+Make the modules of this directory importable the same way as when fetch_vlan_config.py is run as
+a script, i.e. with `connection` as a top-level package.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
@@ -12,12 +12,248 @@ username, and password used to connect to the appliance.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from opentelemetry import trace
-import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ContextDecorator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+import asyncio
+import functools
+import logging
 import os
-import boto3
+import threading
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+if TYPE_CHECKING:
+    from aws_secretsmanager_caching import SecretCache
+
+logger = logging.getLogger(__name__)
+
+# boto3, botocore and aws_secretsmanager_caching are imported on first use rather than at module
+# import time: loading botocore takes hundreds of milliseconds, which would otherwise be paid by
+# every process importing this module.
+
+
+class _NoOpSpan(ContextDecorator):
+    """
+    A span which records nothing, used when OpenTelemetry is not installed.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attributes(self, attributes):
+        """Discard the attributes."""
+
+    def set_status(self, status):
+        """Discard the status."""
+
+    def record_exception(self, exception):
+        """Discard the exception."""
+
+
+class _NoOpTracer:
+    """
+    A tracer which creates no-op spans, used when OpenTelemetry is not installed.
+    """
+
+    def start_as_current_span(self, *args, **kwargs):
+        """Return a span which records nothing."""
+        return _NoOpSpan()
+
+
+tracer = trace.get_tracer("junos_pyez_config") if trace is not None else _NoOpTracer()
+
+# Parsed connection information, keyed by secret ID. The raw secret string is stored alongside the
+# parsed object so that a rotated secret is detected and re-parsed.
+_CONNECTION_INFO_CACHE: dict[
+    str, tuple[str | bytes, NetworkApplianceConnectionInfo]
+] = {}
+_CONNECTION_INFO_CACHE_LOCK = threading.Lock()
+
+# Secret encodings accepted in the SECRET_FORMAT environment variable. CBOR-encoded secrets must be
+# stored as SecretBinary, e.g. by a rotation function calling
+# put_secret_value(SecretBinary=cbor2.dumps({...})).
+_VALID_SECRET_FORMATS = frozenset({"json", "cbor"})
+
+# Error codes returned by AWS Secrets Manager when requests are throttled. Stale secrets are served
+# from the Redis cache when one of these, or a server-side error, is returned.
+_THROTTLING_ERROR_CODES = frozenset(
+    {"ThrottlingException", "TooManyRequestsException", "RequestLimitExceeded"}
+)
+
+
+def _is_transient_error(error) -> bool:
+    """
+    Return whether a botocore ClientError was caused by throttling or a server-side failure, as
+    opposed to a problem with the request itself, such as a missing secret or a denied access.
+    """
+    return (
+        error.response.get("Error", {}).get("Code") in _THROTTLING_ERROR_CODES
+        or error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) >= 500
+    )
+
+
+# Maximum number of secrets that can be retrieved by a single BatchGetSecretValue API call.
+BATCH_GET_SECRET_VALUE_LIMIT = 20
+
+# Number of concurrent GetSecretValue calls used when BatchGetSecretValue cannot be used. Beyond
+# 8 to 16 threads, contention on the shared botocore client outweighs the gains.
+GET_SECRET_VALUE_MAX_WORKERS = 8
+
+
+def _chunk_secret_ids(secret_ids: list[str]) -> list[list[str]]:
+    """
+    Split a list of secret identifiers into chunks small enough for a single BatchGetSecretValue
+    API call.
+    """
+    return [
+        secret_ids[start : start + BATCH_GET_SECRET_VALUE_LIMIT]
+        for start in range(0, len(secret_ids), BATCH_GET_SECRET_VALUE_LIMIT)
+    ]
+
+
+# AWS region used when it cannot be determined from the secret ARN or the environment.
+DEFAULT_AWS_REGION = "us-east-1"
+
+
+def _region_for(config_name: str) -> str:
+    """
+    Return the AWS region in which the given secret should be looked up, so that Secrets Manager is
+    reached through its local endpoint. The region is taken from the secret ARN when one is used,
+    then from the AWS_REGION and AWS_DEFAULT_REGION environment variables. ARNs from every
+    partition are recognized, e.g. `arn:aws-us-gov:secretsmanager:...` in AWS GovCloud.
+    """
+    arn = config_name.split(":")
+    if len(arn) > 3 and arn[0] == "arn" and arn[2] == "secretsmanager":
+        return arn[3]
+    return (
+        os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or DEFAULT_AWS_REGION
+    )
+
+
+def _decode_secret(secret_string: str | bytes) -> dict:
+    """
+    Decode a secret payload, according to the encoding selected by the SECRET_FORMAT environment
+    variable. Secrets are JSON-encoded unless SECRET_FORMAT is set to `cbor`. CBOR is only
+    stored as SecretBinary, so secrets still stored as a JSON SecretString are decoded as JSON,
+    which lets secrets be migrated to CBOR one at a time.
+    """
+    secret_format = os.environ.get("SECRET_FORMAT", "json")
+    if secret_format not in _VALID_SECRET_FORMATS:
+        raise IncorrectSecretFormatEnvVarError(secret_format)
+
+    if secret_format == "cbor" and isinstance(secret_string, bytes):
+        import cbor2
+
+        return cbor2.loads(secret_string)
+    return json_loads(secret_string)
+
+
+@functools.cache
+def _redis_client(url: str):
+    """
+    Return the Redis client used as a shared secret cache for the given URL.
+    """
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+# Guards the creation of the shared boto3 session, Secrets Manager clients and secret caches. boto3
+# sessions are not thread-safe, and the first call for a region may come from several worker
+# threads at once. The lock is reentrant, since each secret cache creates its own client.
+_SM_CLIENT_LOCK = threading.RLock()
+
+
+def _thread_safe_cache(function):
+    """
+    Cache the results of a factory function like functools.cache, but call it under
+    _SM_CLIENT_LOCK, so that concurrent first calls share a single object.
+    """
+    cached = functools.cache(function)
+
+    @functools.wraps(function)
+    def wrapper(*args):
+        with _SM_CLIENT_LOCK:
+            return cached(*args)
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+@functools.cache
+def _session():
+    """
+    Return the boto3 session shared by every Secrets Manager client, so credentials are only
+    resolved once per process.
+    """
+    import boto3
+
+    return boto3.session.Session()
+
+
+def _sm_client_config():
+    """
+    Return the botocore configuration used by the Secrets Manager clients. The connection pool is
+    sized for concurrent secret retrieval and connections are kept alive, so TLS handshakes are not
+    repeated, while adaptive retries back off when requests are throttled. The pool size and retry
+    mode can be overridden with the SM_MAX_POOL and SM_RETRY_MODE environment variables.
+    """
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=int(os.environ.get("SM_MAX_POOL", "50")),
+        retries={
+            "mode": os.environ.get("SM_RETRY_MODE", "adaptive"),
+            "max_attempts": 5,
+        },
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=10,
+    )
+
+
+@_thread_safe_cache
+def _sm_client(region: str):
+    """
+    Return the Secrets Manager client for the given region. Building a client is expensive, as
+    botocore loads the service model and resolves the endpoint and credentials, so a single client
+    is created per region and shared by every AWSConfigStrategy instance. boto3 low-level clients
+    are thread-safe, so the shared client may be used from multiple threads.
+    """
+    return _session().client(
+        service_name="secretsmanager", region_name=region, config=_sm_client_config()
+    )
+
+
+@_thread_safe_cache
+def _secret_cache(region: str) -> SecretCache:
+    """
+    Return the client-side secret cache for the given region, backed by the shared Secrets
+    Manager client. The cache calls DescribeSecret before GetSecretValue to find the current
+    version of a secret, so it needs the secretsmanager:DescribeSecret permission in addition to
+    secretsmanager:GetSecretValue. When DescribeSecret is denied, AWSConfigStrategy calls
+    GetSecretValue directly instead, without client-side caching.
+    """
+    from aws_secretsmanager_caching import SecretCache, SecretCacheConfig
+
+    return SecretCache(
+        config=SecretCacheConfig(max_cache_size=16, secret_refresh_interval=3600),
+        client=_sm_client(region),
+    )
 
-tracer = trace.get_tracer("junos_pyez_config")
 
 class AbstractConnectionInfoManager(ABC):
     """
@@ -30,6 +266,10 @@ class AbstractConnectionInfoManager(ABC):
     consumed by the caller to connect to the network appliance.
     """
 
+    # The names of the configuration items retrieved by get_configurations. Concrete classes which
+    # support retrieving multiple configuration items set it in their constructor.
+    config_names: list[str] | None = None
+
     @abstractmethod
     def config_manager_factory(self) -> ConfigStrategy:
         """
@@ -45,6 +285,30 @@ class AbstractConnectionInfoManager(ABC):
         credential_manager = self.config_manager_factory()
         return credential_manager.get_secret()
 
+    @tracer.start_as_current_span("AbstractConnectionInfoManager.get_configurations")
+    def get_configurations(self) -> list[NetworkApplianceConnectionInfo]:
+        """
+        This method is used to retrieve the credentials for every configuration item listed in the
+        config_names attribute from the concrete implementation of the ConfigStrategy class. The
+        connection information is returned in the same order as the configuration item names.
+        When config_names is not set, only the configuration returned by get_configuration is
+        retrieved.
+        """
+        if self.config_names is None:
+            return [self.get_configuration()]
+
+        credential_manager = self.config_manager_factory()
+        secrets = credential_manager.get_secrets(self.config_names)
+        return [secrets[config_name] for config_name in self.config_names]
+
+    async def get_configurations_async(self) -> list[NetworkApplianceConnectionInfo]:
+        """
+        This method is the asynchronous counterpart of get_configurations. The secrets are
+        retrieved in a worker thread without blocking the event loop, so that the connections to
+        the network appliances can be established concurrently.
+        """
+        return await asyncio.to_thread(self.get_configurations)
+
 
 class ConnectionInfoManager(AbstractConnectionInfoManager):
     """
@@ -53,60 +317,72 @@ class ConnectionInfoManager(AbstractConnectionInfoManager):
     configuration should be retrieved.
     """
 
-    @tracer.start_as_current_span("ConnectionInfoManager.__init__")
     def __init__(self):
         """
         This method is used to instantiate the ConnectionInfoManager class. It sets the cloud
         provider and configuration item name from which the network appliance connection info
         should be retrieved.
 
+        Multiple configuration items can be retrieved at once by setting the
+        CONFIGURATION_ITEM_NAMES environment variable to a comma-separated list of names.
+
         Raises:
             MissingConfigurationError: The CONFIGURATION_CLOUD_PROVIDER environment variable is not
             defined.
             MissingConfigurationError: The CONFIGURATION_ITEM_NAME environment variable is not
             defined.
         """
-        if os.getenv("CONFIGURATION_CLOUD_PROVIDER") is None:
+        cloud_provider = os.environ.get("CONFIGURATION_CLOUD_PROVIDER")
+        config_name = os.environ.get("CONFIGURATION_ITEM_NAME")
+        config_names = os.environ.get("CONFIGURATION_ITEM_NAMES")
+
+        if cloud_provider is None:
             raise MissingCloudProviderEnvVarError()
-        if os.getenv("CONFIGURATION_ITEM_NAME") is None:
+        if config_name is None and config_names is None:
             raise MissingConfigItemEnvVarError()
-        self.cloud_provider = os.getenv("CONFIGURATION_CLOUD_PROVIDER")
-        self.config_name = os.getenv("CONFIGURATION_ITEM_NAME")
 
-        if self.cloud_provider not in ["AWS", "AZURE"]:
-            raise IncorrectCloudProviderEnvVarError(self.cloud_provider)
+        if config_names is None:
+            config_names = [config_name]
+        else:
+            config_names = [
+                name.strip() for name in config_names.split(",") if name.strip()
+            ]
+            if not config_names:
+                raise MissingConfigItemEnvVarError()
+            if config_name is None:
+                config_name = config_names[0]
+
+        if cloud_provider not in _STRATEGY_REGISTRY:
+            raise IncorrectCloudProviderEnvVarError(cloud_provider)
+
+        self.cloud_provider = cloud_provider
+        self.config_name = config_name
+        self.config_names = config_names
 
-    @tracer.start_as_current_span("ConnectionInfoManager.config_manager_factory")
     def config_manager_factory(self):
         """
         This method is used to create a ConfigStrategy based on the cloud provider used to retrieve
         the configuration.
         """
-        match self.cloud_provider:
-            case "AWS":
-                return AWSConfigStrategy(self.config_name)
-            case "AZURE":
-                raise NotImplementedError(
-                    "The Azure Cloud integration has not yet been implemented."
-                )
+        try:
+            factory = _STRATEGY_REGISTRY[self.cloud_provider]
+        except KeyError as error:
+            raise IncorrectCloudProviderEnvVarError(self.cloud_provider) from error
+        return factory(self.config_name)
 
 
+@dataclass(slots=True, frozen=True)
 class NetworkApplianceConnectionInfo:
     """
     The NetworkApplianceConnectionInfo class stores credentials for a given network appliance.
+    :param username: The username to use to connect to the network appliance.
+    :param password: The password to use to connect to the network appliance.
+    :param hostname: The hostname of the network appliance.
     """
 
-    @tracer.start_as_current_span("NetworkApplianceConnectionInfo.__init__")
-    def __init__(self, username, password, hostname):
-        """
-        The constructor for the NetworkApplianceConnectionInfo class.
-        :param username: The username to use to connect to the network appliance.
-        :param password: The password to use to connect to the network appliance.
-        :param hostname: The hostname of the network appliance.
-        """
-        self.username = username
-        self.password = password
-        self.hostname = hostname
+    username: str
+    password: str = field(repr=False)
+    hostname: str
 
 
 class ConfigStrategy(ABC):
@@ -122,35 +398,307 @@ class ConfigStrategy(ABC):
         :return: The secret from the secret store.
         """
 
+    def get_secrets(
+        self, secret_ids: list[str]
+    ) -> dict[str, NetworkApplianceConnectionInfo]:
+        """
+        The get_secrets method is used to retrieve multiple secrets from the secret store.
+        Strategies which support retrieving multiple secrets override this method.
+        :param secret_ids: The identifiers of the secrets to retrieve.
+        :return: The secrets from the secret store, keyed by secret identifier.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support retrieving multiple secrets."
+        )
+
 
 class AWSConfigStrategy(ConfigStrategy):
     """
     The AWSSecretStrategy class is used to retrieve the credentials from AWS Secrets Manager.
     """
 
-    @tracer.start_as_current_span("AWSConfigStrategy.__init__")
     def __init__(self, config_name):
         """
         The constructor for the AWSSecretStrategy class.
         """
         self.secret_id = config_name
 
-        self.client = boto3.client(
-            service_name="secretsmanager", region_name="us-east-1"
-        )
+        self.region = _region_for(config_name)
+        self.client = _sm_client(self.region)
+        self.cache = _secret_cache(self.region)
 
     @tracer.start_as_current_span("AWSConfigStrategy.get_secret")
     def get_secret(self) -> NetworkApplianceConnectionInfo:
         """
-        The get_secret method is used to retrieve the credentials from AWS Secrets Manager.
+        The get_secret method is used to retrieve the credentials from AWS Secrets Manager. Secret
+        values are served from a client-side cache, and the parsed configuration is reused for as
+        long as the secret value does not change.
         :return: The credentials for the network appliance.
         """
 
-        secret_string = self.client.get_secret_value(SecretId=self.secret_id)[
-            "SecretString"
+        return self._fetch_one(self.secret_id)
+
+    @tracer.start_as_current_span("AWSConfigStrategy.get_secrets")
+    def get_secrets(
+        self, secret_ids: list[str]
+    ) -> dict[str, NetworkApplianceConnectionInfo]:
+        """
+        The get_secrets method is used to retrieve the credentials for multiple network appliances
+        from AWS Secrets Manager, using as few BatchGetSecretValue API calls as possible.
+
+        The secrets are retrieved individually with get_secrets_threaded instead, through the
+        client-side and Redis caches, when a single secret is requested, when the Redis cache is
+        configured, or when the caller is not allowed to call BatchGetSecretValue. Secrets are
+        requested from the region of their ARN, so that secrets from several regions can be
+        retrieved together.
+        :param secret_ids: The names or ARNs of the secrets to retrieve.
+        :return: The credentials for the network appliances, keyed by secret identifier.
+        """
+        from botocore.exceptions import ClientError
+
+        if len(secret_ids) == 1 or os.environ.get("SECRET_CACHE_REDIS_URL"):
+            return self.get_secrets_threaded(secret_ids)
+
+        secret_ids_by_region = {}
+        for secret_id in secret_ids:
+            secret_ids_by_region.setdefault(_region_for(secret_id), []).append(
+                secret_id
+            )
+
+        chunks = []
+        responses = []
+        try:
+            for region, region_secret_ids in secret_ids_by_region.items():
+                client = _sm_client(region)
+                for chunk in _chunk_secret_ids(region_secret_ids):
+                    responses.append(client.batch_get_secret_value(SecretIdList=chunk))
+                    chunks.append(chunk)
+        except ClientError as error:
+            if error.response["Error"]["Code"] != "AccessDeniedException":
+                raise
+            return self.get_secrets_threaded(secret_ids)
+
+        return self._parse_batch_responses(chunks, responses)
+
+    @tracer.start_as_current_span("AWSConfigStrategy.get_secrets_threaded")
+    def get_secrets_threaded(
+        self, secret_ids: list[str], max_workers=GET_SECRET_VALUE_MAX_WORKERS
+    ) -> dict[str, NetworkApplianceConnectionInfo]:
+        """
+        The get_secrets_threaded method is used to retrieve the credentials for multiple network
+        appliances from AWS Secrets Manager, with one GetSecretValue API call per secret. The calls
+        are issued concurrently from a thread pool, sharing the same client.
+        :param secret_ids: The names or ARNs of the secrets to retrieve.
+        :param max_workers: The maximum number of concurrent API calls.
+        :return: The credentials for the network appliances, keyed by secret identifier.
+        """
+        from botocore.exceptions import ClientError
+
+        def fetch(secret_id):
+            try:
+                return secret_id, self._fetch_one(secret_id)
+            except ClientError as error:
+                if error.response["Error"]["Code"] != "ResourceNotFoundException":
+                    raise
+                return secret_id, None
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            results = list(executor.map(fetch, secret_ids))
+
+        missing_secret_ids = [
+            secret_id for secret_id, config in results if config is None
         ]
+        if missing_secret_ids:
+            raise MissingConfigurationError(", ".join(missing_secret_ids))
+
+        return dict(results)
+
+    def _fetch_one(self, secret_id) -> NetworkApplianceConnectionInfo:
+        """
+        The _fetch_one method is used to retrieve a single secret through the client-side cache.
+        :param secret_id: The name or ARN of the secret to retrieve.
+        :return: The credentials for the network appliance.
+        """
+        redis_url = os.environ.get("SECRET_CACHE_REDIS_URL")
+        if redis_url:
+            secret_string = self._fetch_through_redis(secret_id, redis_url)
+        else:
+            secret_string = self._fetch_from_secret_cache(secret_id)
+
+        return self._parse_secret(secret_id, secret_string)
+
+    def _fetch_from_secret_cache(self, secret_id) -> str | bytes:
+        """
+        The _fetch_from_secret_cache method is used to retrieve a secret payload from the
+        in-process secret cache of the secret's region, which calls AWS Secrets Manager when needed.
+        The secret is retrieved directly from AWS Secrets Manager if the caller is not allowed to
+        call DescribeSecret, which the secret cache relies on.
+        :param secret_id: The name or ARN of the secret to retrieve.
+        :return: The secret payload.
+        """
+        from botocore.exceptions import ClientError
 
-        secret_json = json.loads(secret_string)
+        cache = _secret_cache(_region_for(secret_id))
+        try:
+            secret_string = cache.get_secret_string(secret_id)
+            if secret_string is None:
+                secret_string = cache.get_secret_binary(secret_id)
+        except ClientError as error:
+            if (
+                error.operation_name != "DescribeSecret"
+                or error.response["Error"]["Code"] != "AccessDeniedException"
+            ):
+                raise
+            return self._fetch_from_secrets_manager(secret_id)
+        return secret_string
+
+    def _fetch_from_secrets_manager(self, secret_id) -> str | bytes:
+        """
+        The _fetch_from_secrets_manager method is used to retrieve a secret payload directly from
+        AWS Secrets Manager, bypassing the in-process secret cache.
+        :param secret_id: The name or ARN of the secret to retrieve.
+        :return: The secret payload.
+        """
+        response = _sm_client(_region_for(secret_id)).get_secret_value(
+            SecretId=secret_id
+        )
+        return self._secret_payload(response)
+
+    def _fetch_through_redis(self, secret_id, redis_url) -> str | bytes:
+        """
+        The _fetch_through_redis method is used to retrieve a secret payload through a Redis cache
+        shared by every process, so that only one of them needs to call AWS Secrets Manager per
+        refresh interval. On a miss, the secret is retrieved directly from AWS Secrets Manager
+        rather than from the in-process secret cache, which could hold an older value and write it
+        back to Redis as fresh. Entries are considered fresh for SECRET_CACHE_REDIS_TTL seconds,
+        and are kept for SECRET_CACHE_REDIS_STALE_TTL seconds so they can be served if AWS Secrets
+        Manager cannot be reached, throttles the request or fails with a server-side error. The
+        Redis server stores the secrets in plain text, and must be secured accordingly.
+        :param secret_id: The name or ARN of the secret to retrieve.
+        :param redis_url: The URL of the Redis server.
+        :return: The secret payload.
+        """
+        from botocore.exceptions import BotoCoreError, ClientError
+        from redis.exceptions import RedisError
+
+        redis_client = _redis_client(redis_url)
+        key = f"sm:{secret_id}"
+        fresh_key = f"{key}:fresh"
+
+        try:
+            cached, fresh = redis_client.mget(key, fresh_key)
+        except RedisError as error:
+            logger.warning("Unable to read %s from Redis: %s", key, error)
+            cached, fresh = None, None
+        if cached is not None and fresh is not None:
+            return cached
+
+        try:
+            secret_string = self._fetch_from_secrets_manager(secret_id)
+        except (BotoCoreError, ClientError) as error:
+            if cached is None or (
+                isinstance(error, ClientError) and not _is_transient_error(error)
+            ):
+                raise
+            logger.warning(
+                "Unable to reach AWS Secrets Manager, serving stale %s: %s",
+                secret_id,
+                error,
+            )
+            return cached
+
+        try:
+            pipeline = redis_client.pipeline()
+            pipeline.set(
+                key,
+                secret_string,
+                ex=int(os.environ.get("SECRET_CACHE_REDIS_STALE_TTL", "86400")),
+            )
+            pipeline.set(
+                fresh_key,
+                1,
+                ex=int(os.environ.get("SECRET_CACHE_REDIS_TTL", "3600")),
+            )
+            pipeline.execute()
+        except RedisError as error:
+            logger.warning("Unable to write %s to Redis: %s", key, error)
+
+        return secret_string
+
+    @classmethod
+    def _parse_batch_responses(
+        cls, chunks, responses
+    ) -> dict[str, NetworkApplianceConnectionInfo]:
+        """
+        The _parse_batch_responses method is used to convert BatchGetSecretValue responses into
+        NetworkApplianceConnectionInfo objects. Secrets which do not exist are reported together
+        in a MissingConfigurationError, while any other per-secret error, such as a denied access
+        or a decryption failure, is reported in a SecretRetrievalError.
+        :param chunks: The secret identifiers requested by each API call.
+        :param responses: The responses returned by each API call.
+        :return: The credentials for the network appliances, keyed by secret identifier.
+        """
+        configs = {}
+        missing_secret_ids = []
+        failed_secret_ids = {}
+
+        for chunk, response in zip(chunks, responses):
+            secret_values = {}
+            for secret_value in response["SecretValues"]:
+                secret_values[secret_value["Name"]] = secret_value
+                secret_values[secret_value["ARN"]] = secret_value
+
+            error_codes = {
+                error["SecretId"]: error.get("ErrorCode")
+                for error in response.get("Errors", [])
+            }
+
+            for secret_id in chunk:
+                if secret_id in secret_values:
+                    configs[secret_id] = cls._parse_secret(
+                        secret_id, cls._secret_payload(secret_values[secret_id])
+                    )
+                elif error_codes.get(secret_id) in (None, "ResourceNotFoundException"):
+                    missing_secret_ids.append(secret_id)
+                else:
+                    failed_secret_ids[secret_id] = error_codes[secret_id]
+
+        if failed_secret_ids:
+            raise SecretRetrievalError(failed_secret_ids)
+        if missing_secret_ids:
+            raise MissingConfigurationError(", ".join(missing_secret_ids))
+
+        return configs
+
+    @staticmethod
+    def _secret_payload(secret_value) -> str | bytes:
+        """
+        The _secret_payload method is used to extract the payload of a secret returned by the
+        Secrets Manager API. SecretBinary is used when present, since it can be parsed without
+        decoding it first.
+        :param secret_value: The secret returned by the Secrets Manager API.
+        :return: The JSON-encoded secret payload.
+        """
+        if "SecretBinary" in secret_value:
+            return secret_value["SecretBinary"]
+        return secret_value["SecretString"]
+
+    @staticmethod
+    def _parse_secret(secret_id, secret_string) -> NetworkApplianceConnectionInfo:
+        """
+        The _parse_secret method is used to convert a secret string into a
+        NetworkApplianceConnectionInfo object. The parsed object is reused for as long as the
+        secret string does not change.
+        :param secret_id: The identifier of the secret.
+        :param secret_string: The encoded secret, as a string or as bytes.
+        :return: The credentials for the network appliance.
+        """
+        with _CONNECTION_INFO_CACHE_LOCK:
+            cached = _CONNECTION_INFO_CACHE.get(secret_id)
+        if cached is not None and cached[0] == secret_string:
+            return cached[1]
+
+        secret_json = _decode_secret(secret_string)
 
         try:
             config = NetworkApplianceConnectionInfo(
@@ -161,26 +709,45 @@ class AWSConfigStrategy(ConfigStrategy):
         except KeyError as error:
             raise MissingConfigurationError(error.args[0]) from error
 
+        with _CONNECTION_INFO_CACHE_LOCK:
+            _CONNECTION_INFO_CACHE[secret_id] = (secret_string, config)
+
         return config
 
 
+def _azure_not_implemented(config_name):
+    """
+    Placeholder strategy factory for Azure, which is not supported yet.
+    """
+    raise NotImplementedError(
+        "The Azure Cloud integration has not yet been implemented."
+    )
+
+
+# Strategy factories, keyed by the cloud providers accepted in the CONFIGURATION_CLOUD_PROVIDER
+# environment variable. New cloud providers are supported by registering their strategies here.
+_STRATEGY_REGISTRY: dict[str, Callable[[str], ConfigStrategy]] = {
+    "AWS": AWSConfigStrategy,
+    "AZURE": _azure_not_implemented,
+}
+
+
 class MissingCloudProviderEnvVarError(Exception):
     """Raised when a cloud provider environment variable is missing."""
 
+    _MSG = "The CONFIGURATION_CLOUD_PROVIDER environment variable has not been set."
+
     def __init__(self):
-        super().__init__(
-            self,
-            "The CONFIGURATION_CLOUD_PROVIDER environment variable has not been set.",
-        )
+        super().__init__(self._MSG)
 
 
 class MissingConfigItemEnvVarError(Exception):
     """Raised when a cloud provider environment variable is missing."""
 
+    _MSG = "The CONFIGURATION_ITEM_NAME environment variable has not been set."
+
     def __init__(self):
-        super().__init__(
-            self, "The CONFIGURATION_ITEM_NAME environment variable has not been set."
-        )
+        super().__init__(self._MSG)
 
 
 class IncorrectCloudProviderEnvVarError(Exception):
@@ -189,16 +756,38 @@ class IncorrectCloudProviderEnvVarError(Exception):
     def __init__(self, cloud_provider):
         self.cloud_provider = cloud_provider
         super().__init__(
-            self,
             f"The {cloud_provider} cloud provider is not supported. "
             + "Valid values are `AWS` or `AZURE`",
         )
 
 
+class IncorrectSecretFormatEnvVarError(Exception):
+    """Raised when the secret format environment variable has an unsupported value."""
+
+    def __init__(self, secret_format):
+        self.secret_format = secret_format
+        super().__init__(
+            f"The {secret_format} secret format is not supported. "
+            + "Valid values are `json` or `cbor`",
+        )
+
+
+class SecretRetrievalError(Exception):
+    """Raised when secrets exist but could not be retrieved from the secret store."""
+
+    def __init__(self, error_codes):
+        self.error_codes = error_codes
+        super().__init__(
+            "The following secrets could not be retrieved: "
+            + ", ".join(
+                f"{secret_id} ({error_code})"
+                for secret_id, error_code in error_codes.items()
+            )
+        )
+
+
 class MissingConfigurationError(Exception):
     """Raised when a configuration item is missing from the configuration."""
 
     def __init__(self, configuration_item):
-        super().__init__(
-            self, f"The {configuration_item} configuration item is missing."
-        )
+        super().__init__(f"The {configuration_item} configuration item is missing.")
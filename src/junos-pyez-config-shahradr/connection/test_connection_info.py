@@ -3,21 +3,46 @@ This module contains tests for the src/junos-pyez-config-shahradr/connection/con
 module.
 """
 
+import asyncio
+import dataclasses
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cbor2
+from botocore.exceptions import ClientError, EndpointConnectionError
 from moto import mock_secretsmanager
 import boto3
 import pytest
+from . import connection_info
 from .connection_info import (
     AWSConfigStrategy,
     MissingConfigurationError,
     MissingCloudProviderEnvVarError,
     MissingConfigItemEnvVarError,
     IncorrectCloudProviderEnvVarError,
+    IncorrectSecretFormatEnvVarError,
+    SecretRetrievalError,
     ConnectionInfoManager,
+    NetworkApplianceConnectionInfo,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_secret_caches(monkeypatch):
+    """
+    The Secrets Manager clients, secret caches and parsed configurations are shared across the
+    module. Clear them before each test, so that secrets created by one test are not served to the
+    next. The region is also pinned to `us-east-1`, where the tests create their secrets.
+    """
+    monkeypatch.delenv("AWS_REGION", raising=False)
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    connection_info._sm_client.cache_clear()
+    connection_info._secret_cache.cache_clear()
+    with connection_info._CONNECTION_INFO_CACHE_LOCK:
+        connection_info._CONNECTION_INFO_CACHE.clear()
+
+
 @mock_secretsmanager
 def test_retrieve_configuration_from_aws_secretsmanager():
     """
@@ -38,6 +63,112 @@ def test_retrieve_configuration_from_aws_secretsmanager():
     assert secret.hostname == "router1.example.com"
 
 
+@mock_secretsmanager
+def test_retrieve_binary_configuration_from_aws_secretsmanager():
+    """
+    This test is used to verify that the AWSConfigStrategy class is able to retrieve a
+    configuration stored as a JSON-encoded SecretBinary in AWS Secrets Manager.
+    """
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="secret_configuration",
+        SecretBinary=b'{"username": "juniper", '
+        + b'"password": "Passw0rd!", '  # pragma: allowlist secret
+        + b'"hostname": "router1.example.com"}',
+    )
+
+    secret = AWSConfigStrategy("secret_configuration").get_secret()
+    assert secret.username == "juniper"
+    assert secret.password == "Passw0rd!"  # pragma: allowlist secret
+    assert secret.hostname == "router1.example.com"
+
+
+@mock_secretsmanager
+def test_retrieve_cbor_configuration_from_aws_secretsmanager(monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class is able to retrieve a
+    configuration stored as a CBOR-encoded SecretBinary when SECRET_FORMAT is set to `cbor`.
+    """
+    monkeypatch.setenv("SECRET_FORMAT", "cbor")
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="secret_configuration",
+        SecretBinary=cbor2.dumps(
+            {
+                "username": "juniper",
+                "password": "Passw0rd!",  # pragma: allowlist secret
+                "hostname": "router1.example.com",
+            }
+        ),
+    )
+
+    secret = AWSConfigStrategy("secret_configuration").get_secret()
+    assert secret.username == "juniper"
+    assert secret.password == "Passw0rd!"  # pragma: allowlist secret
+    assert secret.hostname == "router1.example.com"
+
+
+@mock_secretsmanager
+def test_retrieve_json_configuration_when_secret_format_is_cbor(monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class still retrieves a configuration
+    stored as a JSON SecretString when SECRET_FORMAT is set to `cbor`, so that secrets can be
+    migrated to CBOR one at a time.
+    """
+    monkeypatch.setenv("SECRET_FORMAT", "cbor")
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="secret_configuration",
+        SecretString='{"username": "juniper", '
+        + '"password": "Passw0rd!", '  # pragma: allowlist secret
+        + '"hostname": "router1.example.com"}',
+    )
+
+    secret = AWSConfigStrategy("secret_configuration").get_secret()
+    assert secret.hostname == "router1.example.com"
+
+
+@mock_secretsmanager
+def test_retrieve_configuration_with_unsupported_secret_format(monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class throws a
+    `IncorrectSecretFormatEnvVarError` when SECRET_FORMAT is set to an unsupported value.
+    """
+    monkeypatch.setenv("SECRET_FORMAT", "yaml")
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(Name="secret_configuration", SecretString="{}")
+
+    with pytest.raises(
+        IncorrectSecretFormatEnvVarError,
+        match="The yaml secret format is not supported. Valid values are `json` or `cbor`",
+    ):
+        AWSConfigStrategy("secret_configuration").get_secret()
+
+
+@mock_secretsmanager
+def test_retrieve_configuration_from_aws_secretsmanager_is_cached(mocker):
+    """
+    This test is used to verify that repeated calls to the AWSConfigStrategy class are served from
+    the client-side cache, without calling AWS Secrets Manager or parsing the secret again.
+    """
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="secret_configuration",
+        SecretString='{"username": "juniper", '
+        + '"password": "Passw0rd!", '  # pragma: allowlist secret
+        + '"hostname": "router1.example.com"}',
+    )
+
+    strategy = AWSConfigStrategy("secret_configuration")
+    get_secret_value = mocker.spy(strategy.client, "get_secret_value")
+
+    first = strategy.get_secret()
+    second = strategy.get_secret()
+
+    assert first is second
+    get_secret_value.assert_called_once()
+
+
 @mock_secretsmanager
 def test_retrieve_configuration_from_aws_secretsmanager_with_missing_hostname():
     """
@@ -109,12 +240,165 @@ def test_retrieve_configuration_from_aws_secretsmanager_with_missing_secret():
         Exception,
         match=re.escape(
             "An error occurred (ResourceNotFoundException) when calling the "
-            + "GetSecretValue operation: Secrets Manager can't find the specified secret."
+            + "DescribeSecret operation: Secrets Manager can't find the specified secret."
         ),
     ):
         AWSConfigStrategy("secret_configuration").get_secret()
 
 
+@mock_secretsmanager
+def test_retrieve_configuration_without_describe_secret_permission(mocker):
+    """
+    This test is used to verify that the AWSConfigStrategy class retrieves the secret with
+    GetSecretValue alone when the caller is not allowed to call DescribeSecret.
+    """
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="secret_configuration",
+        SecretString='{"username": "juniper", '
+        + '"password": "Passw0rd!", '  # pragma: allowlist secret
+        + '"hostname": "router1.example.com"}',
+    )
+
+    strategy = AWSConfigStrategy("secret_configuration")
+    mocker.patch.object(
+        strategy.client,
+        "describe_secret",
+        side_effect=ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "Denied"}},
+            "DescribeSecret",
+        ),
+    )
+
+    assert strategy.get_secret().hostname == "router1.example.com"
+
+
+def test_network_appliance_connection_info_is_immutable():
+    """
+    This test is used to verify that NetworkApplianceConnectionInfo objects cannot be modified, and
+    can be used as dictionary keys.
+    """
+    config = NetworkApplianceConnectionInfo(
+        username="juniper",
+        password="Passw0rd!",  # pragma: allowlist secret
+        hostname="router1.example.com",
+    )
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.hostname = "router2.example.com"
+    assert {config: "router1"}[config] == "router1"
+
+
+def test_network_appliance_connection_info_repr_hides_password():
+    """
+    This test is used to verify that the password is not included in the representation of
+    NetworkApplianceConnectionInfo objects, so that it is not leaked into logs and tracebacks.
+    """
+    config = NetworkApplianceConnectionInfo(
+        username="juniper",
+        password="Passw0rd!",  # pragma: allowlist secret
+        hostname="router1.example.com",
+    )
+
+    assert "Passw0rd!" not in repr(config)
+    assert "router1.example.com" in repr(config)
+
+
+def test_aws_config_strategy_shares_client():
+    """
+    This test is used to verify that AWSConfigStrategy instances reuse the same Secrets Manager
+    client instead of creating a new one each time.
+    """
+    assert AWSConfigStrategy("router1").client is AWSConfigStrategy("router2").client
+
+
+def test_aws_config_strategy_shares_client_across_threads():
+    """
+    This test is used to verify that concurrent first calls for a region share a single Secrets
+    Manager client and secret cache.
+    """
+    barrier = threading.Barrier(8)
+
+    def build_strategy(_):
+        barrier.wait()
+        return AWSConfigStrategy("router1")
+
+    with ThreadPoolExecutor(8) as executor:
+        strategies = list(executor.map(build_strategy, range(8)))
+
+    assert len({id(strategy.client) for strategy in strategies}) == 1
+    assert len({id(strategy.cache) for strategy in strategies}) == 1
+
+
+def test_aws_config_strategy_client_config(monkeypatch):
+    """
+    This test is used to verify that the Secrets Manager client is tuned for concurrent use, and
+    that the connection pool size and retry mode can be overridden from the environment.
+    """
+    config = AWSConfigStrategy("router1").client.meta.config
+    assert config.max_pool_connections == 50
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive
+
+    connection_info._sm_client.cache_clear()
+    monkeypatch.setenv("SM_MAX_POOL", "16")
+    monkeypatch.setenv("SM_RETRY_MODE", "standard")
+
+    config = AWSConfigStrategy("router1").client.meta.config
+    assert config.max_pool_connections == 16
+    assert config.retries["mode"] == "standard"
+
+
+def test_aws_config_strategy_region_from_arn(monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class uses the region contained in the
+    secret ARN, regardless of the region set in the environment.
+    """
+    monkeypatch.setenv("AWS_REGION", "eu-west-1")
+
+    strategy = AWSConfigStrategy(
+        "arn:aws:secretsmanager:ca-central-1:123456789012:secret:router1"
+    )
+
+    assert strategy.region == "ca-central-1"
+    assert strategy.client.meta.region_name == "ca-central-1"
+
+
+@pytest.mark.parametrize(
+    "arn, region",
+    [
+        (
+            "arn:aws-us-gov:secretsmanager:us-gov-west-1:123456789012:secret:r1",
+            "us-gov-west-1",
+        ),
+        ("arn:aws-cn:secretsmanager:cn-north-1:123456789012:secret:r1", "cn-north-1"),
+    ],
+)
+def test_aws_config_strategy_region_from_arn_in_other_partitions(
+    monkeypatch, arn, region
+):
+    """
+    This test is used to verify that the AWSConfigStrategy class uses the region contained in
+    secret ARNs from the AWS GovCloud and China partitions.
+    """
+    monkeypatch.setenv("AWS_REGION", "eu-west-1")
+
+    assert AWSConfigStrategy(arn).region == region
+
+
+def test_aws_config_strategy_region_from_environment(monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class uses the region set in the
+    environment when the secret is referenced by name, and defaults to `us-east-1` otherwise.
+    """
+    monkeypatch.delenv("AWS_REGION", raising=False)
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+    assert AWSConfigStrategy("router1").region == "eu-west-1"
+
+    monkeypatch.delenv("AWS_DEFAULT_REGION")
+    assert AWSConfigStrategy("router1").region == "us-east-1"
+
+
 def test_connection_info_manager_aws(mocker):
     """
     This test is used to verify that the ConnectionInfoManager class is able to retrieve the
@@ -163,6 +447,19 @@ def test_connection_info_manager_missing_configuration_item_name_env_var():
         ConnectionInfoManager().config_manager_factory()
 
 
+def test_exception_messages():
+    """
+    This test is used to verify that the exceptions raised by the connection_info module only
+    carry their message, so that `str()` returns it unchanged.
+    """
+    error = MissingConfigurationError("hostname")
+
+    assert error.args == ("The hostname configuration item is missing.",)
+    assert str(MissingCloudProviderEnvVarError()) == (
+        "The CONFIGURATION_CLOUD_PROVIDER environment variable has not been set."
+    )
+
+
 def test_connection_info_manager_unsupported_cloud_provider():
     """
     This test is used to verify that the ConnectionInfoManager class throws a
@@ -192,3 +489,431 @@ def test_connection_info_manager_azure_not_implemented():
         match="The Azure Cloud integration has not yet been implemented.",
     ):
         ConnectionInfoManager().config_manager_factory()
+
+
+def test_third_party_connection_info_manager():
+    """
+    This test is used to verify that a connection info manager which only implements the original
+    abstract methods can still be instantiated, and that get_configurations and
+    get_configurations_async fall back to its get_configuration method.
+    """
+    connection_info_model = NetworkApplianceConnectionInfo(
+        username="admin", password="password", hostname="router1"
+    )
+
+    class StaticConfigStrategy(connection_info.ConfigStrategy):
+        def get_secret(self):
+            return connection_info_model
+
+    class StaticConnectionInfoManager(connection_info.AbstractConnectionInfoManager):
+        def config_manager_factory(self):
+            return StaticConfigStrategy()
+
+    manager = StaticConnectionInfoManager()
+
+    assert manager.get_configurations() == [connection_info_model]
+    assert asyncio.run(manager.get_configurations_async()) == [connection_info_model]
+    with pytest.raises(NotImplementedError):
+        StaticConfigStrategy().get_secrets(["router1"])
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_from_aws_secretsmanager_in_batches(mocker):
+    """
+    This test is used to verify that the AWSConfigStrategy class retrieves multiple configurations
+    from AWS Secrets Manager using BatchGetSecretValue, with at most 20 secrets per API call.
+    """
+    secret_ids = [f"router{index}" for index in range(25)]
+
+    def batch_get_secret_value(SecretIdList):
+        return {
+            "SecretValues": [
+                {
+                    "Name": secret_id,
+                    "ARN": f"arn:aws:secretsmanager:us-east-1:123456789012:secret:{secret_id}",
+                    "SecretString": '{"username": "juniper", '
+                    + '"password": "Passw0rd!", '  # pragma: allowlist secret
+                    + f'"hostname": "{secret_id}.example.com"}}',
+                }
+                for secret_id in SecretIdList
+            ],
+            "Errors": [],
+        }
+
+    strategy = AWSConfigStrategy("router0")
+    method = mocker.patch.object(
+        strategy.client, "batch_get_secret_value", side_effect=batch_get_secret_value
+    )
+
+    secrets = strategy.get_secrets(secret_ids)
+
+    assert method.call_count == 2
+    assert len(method.call_args_list[0].kwargs["SecretIdList"]) == 20
+    assert len(method.call_args_list[1].kwargs["SecretIdList"]) == 5
+    assert secrets["router24"].hostname == "router24.example.com"
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_from_aws_secretsmanager_in_several_regions(mocker):
+    """
+    This test is used to verify that the AWSConfigStrategy class retrieves secrets from the region
+    of their ARN, both with BatchGetSecretValue and with individual GetSecretValue calls.
+    """
+    secret_ids = []
+    for region in ("us-east-1", "eu-west-1"):
+        client = boto3.client("secretsmanager", region_name=region)
+        response = client.create_secret(
+            Name=f"router-{region}",
+            SecretString='{"username": "juniper", '
+            + '"password": "Passw0rd!", '  # pragma: allowlist secret
+            + f'"hostname": "{region}.example.com"}}',
+        )
+        secret_ids.append(response["ARN"])
+
+    strategy = AWSConfigStrategy(secret_ids[0])
+    secrets = strategy.get_secrets_threaded(secret_ids)
+    assert [secrets[secret_id].hostname for secret_id in secret_ids] == [
+        "us-east-1.example.com",
+        "eu-west-1.example.com",
+    ]
+
+    def batch_get_secret_value(SecretIdList):
+        return {
+            "SecretValues": [
+                {
+                    "Name": secret_id.split(":")[-1],
+                    "ARN": secret_id,
+                    "SecretString": '{"username": "juniper", '
+                    + '"password": "Passw0rd!", '  # pragma: allowlist secret
+                    + f'"hostname": "{secret_id.split(":")[3]}.example.com"}}',
+                }
+                for secret_id in SecretIdList
+            ],
+            "Errors": [],
+        }
+
+    methods = {
+        region: mocker.patch.object(
+            connection_info._sm_client(region),
+            "batch_get_secret_value",
+            side_effect=batch_get_secret_value,
+        )
+        for region in ("us-east-1", "eu-west-1")
+    }
+
+    secrets = strategy.get_secrets(secret_ids)
+
+    methods["us-east-1"].assert_called_once_with(SecretIdList=secret_ids[:1])
+    methods["eu-west-1"].assert_called_once_with(SecretIdList=secret_ids[1:])
+    assert secrets[secret_ids[1]].hostname == "eu-west-1.example.com"
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_from_aws_secretsmanager_with_missing_secrets(mocker):
+    """
+    This test is used to verify that the AWSConfigStrategy class throws a
+    `MissingConfigurationError` listing every secret that could not be retrieved.
+    """
+    strategy = AWSConfigStrategy("router1")
+    mocker.patch.object(
+        strategy.client,
+        "batch_get_secret_value",
+        return_value={
+            "SecretValues": [],
+            "Errors": [
+                {"SecretId": "router1", "ErrorCode": "ResourceNotFoundException"},
+                {"SecretId": "router2", "ErrorCode": "ResourceNotFoundException"},
+            ],
+        },
+    )
+
+    with pytest.raises(
+        MissingConfigurationError,
+        match="The router1, router2 configuration item is missing.",
+    ):
+        strategy.get_secrets(["router1", "router2"])
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_from_aws_secretsmanager_with_batch_errors(mocker):
+    """
+    This test is used to verify that the AWSConfigStrategy class reports the error code of secrets
+    which exist but could not be retrieved, rather than reporting them as missing.
+    """
+    strategy = AWSConfigStrategy("router1")
+    mocker.patch.object(
+        strategy.client,
+        "batch_get_secret_value",
+        return_value={
+            "SecretValues": [],
+            "Errors": [
+                {"SecretId": "router1", "ErrorCode": "ResourceNotFoundException"},
+                {"SecretId": "router2", "ErrorCode": "DecryptionFailure"},
+            ],
+        },
+    )
+
+    with pytest.raises(
+        SecretRetrievalError,
+        match=re.escape(
+            "The following secrets could not be retrieved: router2 (DecryptionFailure)"
+        ),
+    ):
+        strategy.get_secrets(["router1", "router2"])
+
+
+def test_connection_info_manager_multiple_configuration_items(mocker, monkeypatch):
+    """
+    This test is used to verify that the ConnectionInfoManager class retrieves every configuration
+    item listed in the CONFIGURATION_ITEM_NAMES environment variable, in order.
+    """
+    mocker.patch.object(AWSConfigStrategy, "__init__", return_value=None)
+    mocker.patch.object(
+        AWSConfigStrategy,
+        "get_secrets",
+        return_value={"router2": "second", "router1": "first"},
+    )
+
+    monkeypatch.setenv("CONFIGURATION_CLOUD_PROVIDER", "AWS")
+    monkeypatch.delenv("CONFIGURATION_ITEM_NAME", raising=False)
+    monkeypatch.setenv("CONFIGURATION_ITEM_NAMES", "router1, router2")
+
+    assert ConnectionInfoManager().get_configurations() == ["first", "second"]
+
+
+@mock_secretsmanager
+def test_connection_info_manager_single_configuration_item(monkeypatch):
+    """
+    This test is used to verify that a single configuration item is retrieved with GetSecretValue,
+    so that BatchGetSecretValue is not required when CONFIGURATION_ITEM_NAME alone is set.
+    """
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="secret_configuration",
+        SecretString='{"username": "juniper", '
+        + '"password": "Passw0rd!", '  # pragma: allowlist secret
+        + '"hostname": "router1.example.com"}',
+    )
+
+    monkeypatch.setenv("CONFIGURATION_CLOUD_PROVIDER", "AWS")
+    monkeypatch.setenv("CONFIGURATION_ITEM_NAME", "secret_configuration")
+    monkeypatch.delenv("CONFIGURATION_ITEM_NAMES", raising=False)
+
+    configs = asyncio.run(ConnectionInfoManager().get_configurations_async())
+
+    assert [config.hostname for config in configs] == ["router1.example.com"]
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_from_aws_secretsmanager_with_threads():
+    """
+    This test is used to verify that the AWSConfigStrategy class retrieves multiple configurations
+    with concurrent GetSecretValue calls, and reports every missing secret.
+    """
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    for index in range(3):
+        client.create_secret(
+            Name=f"router{index}",
+            SecretString='{"username": "juniper", '
+            + '"password": "Passw0rd!", '  # pragma: allowlist secret
+            + f'"hostname": "router{index}.example.com"}}',
+        )
+
+    strategy = AWSConfigStrategy("router0")
+    secrets = strategy.get_secrets_threaded(["router0", "router1", "router2"])
+    assert secrets["router2"].hostname == "router2.example.com"
+
+    with pytest.raises(
+        MissingConfigurationError,
+        match="The router3, router4 configuration item is missing.",
+    ):
+        strategy.get_secrets_threaded(["router0", "router3", "router4"])
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_falls_back_when_batch_is_denied(mocker):
+    """
+    This test is used to verify that the AWSConfigStrategy class falls back to individual
+    GetSecretValue calls when BatchGetSecretValue is denied.
+    """
+    strategy = AWSConfigStrategy("router1")
+    mocker.patch.object(
+        strategy.client,
+        "batch_get_secret_value",
+        side_effect=ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "Denied"}},
+            "BatchGetSecretValue",
+        ),
+    )
+    method = mocker.patch.object(
+        strategy,
+        "get_secrets_threaded",
+        return_value={"router1": "first", "router2": "second"},
+    )
+
+    assert strategy.get_secrets(["router1", "router2"]) == {
+        "router1": "first",
+        "router2": "second",
+    }
+    method.assert_called_once_with(["router1", "router2"])
+
+
+@mock_secretsmanager
+def test_retrieve_configurations_asynchronously_falls_back_when_batch_is_denied(
+    mocker, monkeypatch
+):
+    """
+    This test is used to verify that get_configurations_async also falls back to individual
+    GetSecretValue calls when BatchGetSecretValue is denied.
+    """
+    mocker.patch.object(
+        connection_info._sm_client("us-east-1"),
+        "batch_get_secret_value",
+        side_effect=ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "Denied"}},
+            "BatchGetSecretValue",
+        ),
+    )
+    method = mocker.patch.object(
+        AWSConfigStrategy,
+        "get_secrets_threaded",
+        return_value={"router1": "first", "router2": "second"},
+    )
+
+    monkeypatch.setenv("CONFIGURATION_CLOUD_PROVIDER", "AWS")
+    monkeypatch.delenv("CONFIGURATION_ITEM_NAME", raising=False)
+    monkeypatch.setenv("CONFIGURATION_ITEM_NAMES", "router1, router2")
+
+    configs = asyncio.run(ConnectionInfoManager().get_configurations_async())
+
+    assert configs == ["first", "second"]
+    method.assert_called_once_with(["router1", "router2"])
+
+
+@mock_secretsmanager
+def test_retrieve_configuration_from_redis_cache(mocker, monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class serves fresh secrets from the
+    Redis cache without calling AWS Secrets Manager.
+    """
+    monkeypatch.setenv("SECRET_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    redis_client = mocker.MagicMock()
+    redis_client.mget.return_value = (
+        b'{"username": "juniper", '
+        + b'"password": "Passw0rd!", '  # pragma: allowlist secret
+        + b'"hostname": "router1.example.com"}',
+        b"1",
+    )
+    mocker.patch.object(connection_info, "_redis_client", return_value=redis_client)
+
+    strategy = AWSConfigStrategy("router1")
+    fetch = mocker.patch.object(strategy, "_fetch_from_secrets_manager")
+
+    assert strategy.get_secret().hostname == "router1.example.com"
+    redis_client.mget.assert_called_once_with("sm:router1", "sm:router1:fresh")
+    fetch.assert_not_called()
+
+
+@mock_secretsmanager
+def test_refresh_redis_cache_from_aws_secretsmanager(mocker, monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class refreshes the Redis cache from
+    AWS Secrets Manager directly, rather than from a possibly outdated in-process secret cache.
+    """
+    client = boto3.client("secretsmanager", region_name="us-east-1")
+    client.create_secret(
+        Name="router1",
+        SecretString='{"username": "juniper", '
+        + '"password": "Passw0rd!", '  # pragma: allowlist secret
+        + '"hostname": "router1.example.com"}',
+    )
+    strategy = AWSConfigStrategy("router1")
+    assert strategy.get_secret().hostname == "router1.example.com"
+
+    rotated_secret = (
+        '{"username": "juniper", '
+        + '"password": "N3wPassw0rd!", '  # pragma: allowlist secret
+        + '"hostname": "router1.example.com"}'
+    )
+    client.put_secret_value(SecretId="router1", SecretString=rotated_secret)
+
+    monkeypatch.setenv("SECRET_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    redis_client = mocker.MagicMock()
+    redis_client.mget.return_value = (None, None)
+    mocker.patch.object(connection_info, "_redis_client", return_value=redis_client)
+
+    assert strategy.get_secret().password == "N3wPassw0rd!"  # pragma: allowlist secret
+    redis_client.pipeline.return_value.set.assert_any_call(
+        "sm:router1", rotated_secret, ex=86400
+    )
+
+
+@mock_secretsmanager
+def test_retrieve_stale_configuration_from_redis_cache(mocker, monkeypatch):
+    """
+    This test is used to verify that the AWSConfigStrategy class serves stale secrets from the
+    Redis cache when AWS Secrets Manager cannot be reached.
+    """
+    monkeypatch.setenv("SECRET_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    redis_client = mocker.MagicMock()
+    redis_client.mget.return_value = (
+        b'{"username": "juniper", '
+        + b'"password": "Passw0rd!", '  # pragma: allowlist secret
+        + b'"hostname": "router1.example.com"}',
+        None,
+    )
+    mocker.patch.object(connection_info, "_redis_client", return_value=redis_client)
+
+    strategy = AWSConfigStrategy("router1")
+    mocker.patch.object(
+        strategy,
+        "_fetch_from_secrets_manager",
+        side_effect=EndpointConnectionError(endpoint_url="https://example.com"),
+    )
+
+    assert strategy.get_secret().hostname == "router1.example.com"
+    redis_client.pipeline.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "code, status, stale",
+    [
+        ("ThrottlingException", 400, True),
+        ("InternalServiceError", 500, True),
+        ("ResourceNotFoundException", 400, False),
+        ("AccessDeniedException", 400, False),
+    ],
+)
+def test_retrieve_stale_configuration_from_redis_cache_on_client_error(
+    mocker, monkeypatch, code, status, stale
+):
+    """
+    This test is used to verify that the AWSConfigStrategy class serves stale secrets from the
+    Redis cache when AWS Secrets Manager throttles the request or fails with a server-side error,
+    but not when the secret is missing or the access is denied.
+    """
+    monkeypatch.setenv("SECRET_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    redis_client = mocker.MagicMock()
+    redis_client.mget.return_value = (
+        b'{"username": "juniper", '
+        + b'"password": "Passw0rd!", '  # pragma: allowlist secret
+        + b'"hostname": "router1.example.com"}',
+        None,
+    )
+    mocker.patch.object(connection_info, "_redis_client", return_value=redis_client)
+
+    strategy = AWSConfigStrategy("router1")
+    error = ClientError(
+        {
+            "Error": {"Code": code, "Message": "Error"},
+            "ResponseMetadata": {"HTTPStatusCode": status},
+        },
+        "GetSecretValue",
+    )
+    mocker.patch.object(strategy, "_fetch_from_secrets_manager", side_effect=error)
+
+    if stale:
+        assert strategy.get_secret().hostname == "router1.example.com"
+    else:
+        with pytest.raises(ClientError):
+            strategy.get_secret()
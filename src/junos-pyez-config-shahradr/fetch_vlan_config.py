@@ -2,69 +2,233 @@
 Retrieve the VLAN configuration from a Juniper Networks appliance.
 """
 
+import asyncio
+import atexit
+import copy
+import functools
+import logging
 import sys
-import inspect
+import threading
+from types import MappingProxyType
 
 from connection.connection_info import (
     ConnectionInfoManager,
     NetworkApplianceConnectionInfo,
 )
-from jnpr.junos import Device
-from jnpr.junos.exception import ConnectError
-from lxml import etree
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 from opentelemetry.semconv.trace import SpanAttributes
 
 VLAN_FILTER = "<configuration><vlans/></configuration>"
 
+# Maximum number of appliances queried at the same time. PyEZ is synchronous, so each connection
+# occupies a worker thread for its whole duration.
+MAX_CONCURRENT_CONNECTIONS = 32
+
 # Creates a tracer from the global tracer provider
 tracer = trace.get_tracer(__name__)
 
+logger = logging.getLogger(__name__)
+
+# Open PyEZ devices, keyed by hostname, so that NETCONF sessions are reused across calls instead
+# of going through the SSH handshake every time. Each device is stored with the connection
+# information it was created from, so it is rebuilt when the credentials change, and paired with
+# a lock, since a PyEZ device cannot be used by more than one thread at a time.
+_DEVICE_POOL = {}
+_DEVICE_POOL_LOCK = threading.Lock()
+
+
+@functools.cache
+def _vlan_filter():
+    """
+    Return VLAN_FILTER parsed into an lxml element. The filter is only parsed once, instead of
+    being parsed again by PyEZ on every RPC.
+    """
+    from lxml import etree
+
+    return etree.fromstring(VLAN_FILTER)
+
+
+def _get_device(device_config: NetworkApplianceConnectionInfo):
+    """
+    Return the pooled PyEZ device for the given appliance, along with the lock guarding it. The
+    device is created on first use, but not opened. A pooled device created from different
+    connection information, e.g. before the credentials were rotated, is closed and replaced.
+    """
+    from jnpr.junos import Device
+
+    stale_entry = None
+    with _DEVICE_POOL_LOCK:
+        entry = _DEVICE_POOL.get(device_config.hostname)
+        if entry is not None and entry[0] != device_config:
+            stale_entry, entry = entry, None
+        if entry is None:
+            entry = (
+                device_config,
+                Device(
+                    host=device_config.hostname,
+                    user=device_config.username,
+                    password=device_config.password,
+                ),
+                threading.Lock(),
+            )
+            _DEVICE_POOL[device_config.hostname] = entry
+
+    if stale_entry is not None:
+        _, stale_dev, stale_lock = stale_entry
+        with stale_lock:
+            if stale_dev.connected:
+                stale_dev.close()
+
+    return entry[1], entry[2]
+
+
+def _evict_device(hostname, dev):
+    """
+    Close a pooled PyEZ device and remove it from the pool, so that the next call opens a new
+    NETCONF session. The caller must hold the lock guarding the device.
+    """
+    with _DEVICE_POOL_LOCK:
+        entry = _DEVICE_POOL.get(hostname)
+        if entry is not None and entry[1] is dev:
+            del _DEVICE_POOL[hostname]
+
+    if dev.connected:
+        dev.close()
+
+
+def _is_pooled(hostname, dev) -> bool:
+    """
+    Return whether the given PyEZ device is still the one pooled for the appliance. A device may
+    be replaced or evicted while a thread is waiting for its lock.
+    """
+    with _DEVICE_POOL_LOCK:
+        entry = _DEVICE_POOL.get(hostname)
+        return entry is not None and entry[1] is dev
+
 
-@tracer.start_as_current_span("fetch_vlan_config")
-def connect_to_device(device_config: NetworkApplianceConnectionInfo):
+@atexit.register
+def _close_devices():
+    """
+    Close the NETCONF sessions left open in the device pool when the process exits.
+    """
+    with _DEVICE_POOL_LOCK:
+        for _, dev, _ in _DEVICE_POOL.values():
+            if dev.connected:
+                dev.close()
+        _DEVICE_POOL.clear()
+
+
+def fetch_config(device_config: NetworkApplianceConnectionInfo):
+    """
+    Retrieve the VLAN configuration of a Juniper Networks appliance, opening a NETCONF session to
+    it if the pool does not already hold one. This function blocks until the RPC completes. The
+    device is dropped from the pool if the connection or the RPC fails.
+    """
+    from jnpr.junos.exception import ConnectError, RpcError
+
+    while True:
+        dev, dev_lock = _get_device(device_config)
+
+        with dev_lock:
+            # Opening a device which is no longer pooled would leak its NETCONF session, so fetch
+            # the pooled device again if it was replaced or evicted in the meantime.
+            if not _is_pooled(device_config.hostname, dev):
+                continue
+            try:
+                if not dev.connected:
+                    dev.open()
+                # PyEZ moves the filter element into the RPC document, so each call needs its own
+                # copy.
+                return dev.rpc.get_config(filter_xml=copy.deepcopy(_vlan_filter()))
+            except (ConnectError, RpcError):
+                _evict_device(device_config.hostname, dev)
+                raise
+
+
+async def connect_to_device(
+    device_config: NetworkApplianceConnectionInfo, semaphore: asyncio.Semaphore
+):
     """
     Connect to a Juniper Networks appliance using the provided configuration, and retrieve the
-    VLAN configuration.
+    VLAN configuration. Connection and RPC errors are recorded on the span rather than raised, so
+    that one unreachable appliance does not interrupt the others.
+    :return: True if the VLAN configuration was retrieved, False otherwise.
     """
+    # PyEZ and lxml are slow to import, so they are only loaded once a device is contacted.
+    from jnpr.junos.exception import ConnectError, RpcError
+    from lxml import etree
+
     junos_config = None
 
     with tracer.start_as_current_span(name="junos-connection", kind=trace.SpanKind.SERVER) as network_span:
         network_span.set_attributes(
             {
+                **_STATIC_SPAN_ATTRIBUTES,
                 SpanAttributes.NET_PEER_IP: device_config.hostname,
                 SpanAttributes.NET_PEER_NAME: device_config.hostname,
-                SpanAttributes.NET_PEER_PORT: 830,
-                SpanAttributes.NET_TRANSPORT: "IP.TCP",
-                "net.app.protocol.name": "netconf",
-                "net.app.protocol.version": "1.0",
                 SpanAttributes.ENDUSER_ID: device_config.username,
-                SpanAttributes.CODE_FILEPATH: __file__,
-                SpanAttributes.CODE_FUNCTION: inspect.currentframe().f_code.co_name,
-                SpanAttributes.CODE_LINENO: inspect.currentframe().f_lineno,
-                SpanAttributes.CODE_NAMESPACE: __name__
             }
         )
 
-        with Device(
-            host=device_config.hostname,
-            user=device_config.username,
-            password=device_config.password,
-        ) as dev:
-            try:
-                junos_config = dev.rpc.get_config(filter_xml=filter)
-            except ConnectError as err:
-                network_span.set_status(Status(StatusCode.ERROR, err))
-                network_span.record_exception(err)
-                sys.exit(1)
-
-    etree.tostring(
-        junos_config,
-        encoding="unicode",
-        pretty_print=True,
+        try:
+            async with semaphore:
+                junos_config = await asyncio.to_thread(fetch_config, device_config)
+        except (ConnectError, RpcError) as err:
+            network_span.set_status(Status(StatusCode.ERROR, str(err)))
+            network_span.record_exception(err)
+            logger.error(
+                "Unable to retrieve the VLAN configuration of %s: %s",
+                device_config.hostname,
+                err,
+            )
+            return False
+
+    # Write the serialized bytes directly, rather than decoding them into a str first.
+    sys.stdout.buffer.writelines(etree.tostringlist(junos_config, encoding="utf-8"))
+    sys.stdout.buffer.write(b"\n")
+    return True
+
+
+# Span attributes which are the same for every connection, computed once at import time rather
+# than by inspecting the current frame on every call.
+_STATIC_SPAN_ATTRIBUTES = MappingProxyType(
+    {
+        SpanAttributes.NET_PEER_PORT: 830,
+        SpanAttributes.NET_TRANSPORT: "IP.TCP",
+        "net.app.protocol.name": "netconf",
+        "net.app.protocol.version": "1.0",
+        SpanAttributes.CODE_FILEPATH: __file__,
+        SpanAttributes.CODE_FUNCTION: connect_to_device.__name__,
+        SpanAttributes.CODE_LINENO: connect_to_device.__code__.co_firstlineno,
+        SpanAttributes.CODE_NAMESPACE: __name__,
+    }
+)
+
+
+async def main():
+    """
+    Retrieve the connection information for every configured appliance, and fetch their VLAN
+    configuration concurrently. Every appliance is contacted, even when some of them fail.
+    :return: The exit status of the script, which is non-zero if any appliance failed.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONNECTIONS)
+    device_configs = await ConnectionInfoManager().get_configurations_async()
+    results = await asyncio.gather(
+        *[connect_to_device(device_config, semaphore) for device_config in device_configs],
+        return_exceptions=True,
     )
 
+    for device_config, result in zip(device_configs, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                "Unable to retrieve the VLAN configuration of %s",
+                device_config.hostname,
+                exc_info=result,
+            )
+
+    return 0 if all(result is True for result in results) else 1
+
 
-with tracer.start_as_current_span("connect_to_device") as span:
-    connect_to_device(ConnectionInfoManager().get_configuration())
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
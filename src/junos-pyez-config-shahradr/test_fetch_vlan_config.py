@@ -0,0 +1,151 @@
+"""
+Tests for the fetch_vlan_config module.
+"""
+
+from jnpr.junos.exception import ConnectError, RpcError
+import pytest
+
+import fetch_vlan_config
+from connection.connection_info import NetworkApplianceConnectionInfo
+
+
+@pytest.fixture(autouse=True)
+def device_class(mocker):
+    """
+    Replace the PyEZ Device class, so that no NETCONF session is opened, and empty the device pool
+    before and after each test.
+    """
+    fetch_vlan_config._DEVICE_POOL.clear()
+    device_class = mocker.patch("jnpr.junos.Device")
+    device_class.side_effect = lambda **kwargs: mocker.MagicMock(connected=False)
+    yield device_class
+    fetch_vlan_config._DEVICE_POOL.clear()
+
+
+def _device_config(password="Passw0rd!"):  # pragma: allowlist secret
+    return NetworkApplianceConnectionInfo(
+        username="juniper", password=password, hostname="router1.example.com"
+    )
+
+
+def test_fetch_config_reuses_pooled_device(device_class):
+    """
+    This test is used to verify that fetch_config opens a single NETCONF session per appliance,
+    and reuses it across calls.
+    """
+    device_config = _device_config()
+
+    first = fetch_vlan_config.fetch_config(device_config)
+    dev, _ = fetch_vlan_config._get_device(device_config)
+    dev.connected = True
+    second = fetch_vlan_config.fetch_config(device_config)
+
+    device_class.assert_called_once_with(
+        host="router1.example.com",
+        user="juniper",
+        password="Passw0rd!",  # pragma: allowlist secret
+    )
+    dev.open.assert_called_once_with()
+    assert first is second is dev.rpc.get_config.return_value
+    assert dev.rpc.get_config.call_count == 2
+
+
+def test_fetch_config_rebuilds_device_when_credentials_change(device_class):
+    """
+    This test is used to verify that a pooled device is closed and replaced when the appliance is
+    contacted with different connection information.
+    """
+    fetch_vlan_config.fetch_config(_device_config())
+    old_dev, _ = fetch_vlan_config._get_device(_device_config())
+    old_dev.connected = True
+
+    fetch_vlan_config.fetch_config(_device_config(password="N3wPassw0rd!"))
+    new_dev, _ = fetch_vlan_config._get_device(_device_config(password="N3wPassw0rd!"))
+
+    assert new_dev is not old_dev
+    old_dev.close.assert_called_once_with()
+    assert device_class.call_count == 2
+
+
+def test_fetch_config_skips_device_replaced_while_waiting(mocker):
+    """
+    This test is used to verify that fetch_config does not open a device which was replaced in the
+    pool while the calling thread was waiting for its lock, and uses the pooled device instead.
+    """
+    old_dev, old_lock = fetch_vlan_config._get_device(_device_config())
+    new_config = _device_config(password="N3wPassw0rd!")
+    new_dev, _ = fetch_vlan_config._get_device(new_config)
+
+    get_device = fetch_vlan_config._get_device
+    results = iter([(old_dev, old_lock)])
+    mocker.patch.object(
+        fetch_vlan_config,
+        "_get_device",
+        side_effect=lambda device_config: next(results, None) or get_device(device_config),
+    )
+
+    fetch_vlan_config.fetch_config(new_config)
+
+    old_dev.open.assert_not_called()
+    new_dev.open.assert_called_once_with()
+
+
+@pytest.mark.parametrize(
+    "error",
+    [ConnectError(dev=None), RpcError()],
+)
+def test_fetch_config_evicts_device_on_error(error):
+    """
+    This test is used to verify that a pooled device is closed and removed from the pool when the
+    connection or the RPC fails, so that the next call opens a new NETCONF session.
+    """
+    device_config = _device_config()
+    dev, _ = fetch_vlan_config._get_device(device_config)
+    dev.connected = True
+    dev.rpc.get_config.side_effect = error
+
+    with pytest.raises(type(error)):
+        fetch_vlan_config.fetch_config(device_config)
+
+    dev.close.assert_called_once_with()
+    assert device_config.hostname not in fetch_vlan_config._DEVICE_POOL
+
+
+def test_main_contacts_every_appliance_when_one_fails(mocker, capsysbinary):
+    """
+    This test is used to verify that an unreachable appliance does not interrupt the retrieval of
+    the VLAN configuration from the other appliances, and that the script exits with a non-zero
+    status once every appliance has been contacted.
+    """
+    from lxml import etree
+
+    device_configs = [
+        NetworkApplianceConnectionInfo(
+            username="juniper",
+            password="Passw0rd!",  # pragma: allowlist secret
+            hostname=f"router{index}.example.com",
+        )
+        for index in range(3)
+    ]
+    mocker.patch.object(
+        fetch_vlan_config.ConnectionInfoManager,
+        "__init__",
+        return_value=None,
+    )
+    mocker.patch.object(
+        fetch_vlan_config.ConnectionInfoManager,
+        "get_configurations_async",
+        return_value=device_configs,
+    )
+
+    def fetch_config(device_config):
+        if device_config.hostname == "router1.example.com":
+            raise ConnectError(dev=None)
+        if device_config.hostname == "router2.example.com":
+            raise RuntimeError("Unexpected error")
+        return etree.fromstring("<configuration><vlans/></configuration>")
+
+    mocker.patch.object(fetch_vlan_config, "fetch_config", side_effect=fetch_config)
+
+    assert fetch_vlan_config.asyncio.run(fetch_vlan_config.main()) == 1
+    assert capsysbinary.readouterr().out == b"<configuration><vlans/></configuration>\n"